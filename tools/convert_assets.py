@@ -4,6 +4,8 @@
 import struct
 import os
 
+import numpy as np
+
 # PICO-8 16-color palette (RGB888)
 PICO8_PALETTE = [
     (0, 0, 0),        # 0  black (transparent)
@@ -31,8 +33,22 @@ def rgb_to_ps1(r, g, b):
     return (b5 << 10) | (g5 << 5) | r5
 
 
+# PICO-8 palette as PS1 15-bit CLUT (color 0 = transparent = 0x0000)
+PICO8_CLUT_PS1 = tuple(0x0000 if i == 0 else rgb_to_ps1(r, g, b)
+                       for i, (r, g, b) in enumerate(PICO8_PALETTE))
+
+# Text CLUTs: 16 CLUTs, one per text color.
+# Font pixels use index 7. Each CLUT maps index 7 to the desired text color.
+TEXT_CLUTS = tuple(
+    tuple(PICO8_CLUT_PS1[tc] if i == 7 else 0x0000 for i in range(16))
+    for tc in range(16)
+)
+
+
 def read_bmp(filename):
-    """Read BMP, return (width, height, bpp, palette_rgb, rows_of_pixel_indices)."""
+    """Read BMP, return (width, height, bpp, palette_rgb, pixel_indices).
+
+    pixel_indices is a (height, width) uint8 array, top row first."""
     with open(filename, "rb") as f:
         sig = f.read(2)
         assert sig == b"BM", f"Not a BMP file: {filename}"
@@ -57,78 +73,67 @@ def read_bmp(filename):
             b, g, r, _ = struct.unpack("BBBB", f.read(4))
             palette.append((r, g, b))
 
-        # Read pixel data
+        # Read pixel data (rows are padded to a 4-byte boundary)
         f.seek(data_offset)
-        rows = []
 
         if bpp == 4:
             row_bytes = (width + 1) // 2
-            row_pad = (4 - row_bytes % 4) % 4
-            for _ in range(abs_height):
-                raw = f.read(row_bytes)
-                row = []
-                for byte in raw:
-                    row.append((byte >> 4) & 0x0F)
-                    row.append(byte & 0x0F)
-                rows.append(row[:width])
-                f.read(row_pad)
-
         elif bpp == 1:
             row_bytes = (width + 7) // 8
-            row_pad = (4 - row_bytes % 4) % 4
-            for _ in range(abs_height):
-                raw = f.read(row_bytes)
-                row = []
-                for byte in raw:
-                    for bit in range(7, -1, -1):
-                        row.append((byte >> bit) & 1)
-                rows.append(row[:width])
-                f.read(row_pad)
         else:
             raise ValueError(f"Unsupported BPP: {bpp}")
 
+        stride = row_bytes + (4 - row_bytes % 4) % 4
+        raw = np.frombuffer(f.read(stride * abs_height), dtype=np.uint8)
+        raw = raw.reshape(abs_height, stride)[:, :row_bytes]
+
+        if bpp == 4:
+            # High nibble = leftmost pixel
+            rows = np.empty((abs_height, row_bytes * 2), dtype=np.uint8)
+            rows[:, 0::2] = raw >> 4
+            rows[:, 1::2] = raw & 0x0F
+        else:
+            # MSB = leftmost pixel
+            rows = np.unpackbits(raw, axis=1)
+        if rows.shape[1] != width:
+            rows = rows[:, :width]  # drop filler pixels of the last byte
+
         if bottom_up:
-            rows.reverse()
+            rows = rows[::-1]
 
         return width, abs_height, bpp, palette, rows
 
 
 def double_pixels(rows, width, height):
     """Scale each pixel 2x2."""
-    out = []
-    for y in range(height):
-        row = []
-        for x in range(width):
-            row.append(rows[y][x])
-            row.append(rows[y][x])
-        out.append(row)
-        out.append(list(row))
+    out = np.repeat(np.repeat(rows, 2, axis=0), 2, axis=1)
     return out, width * 2, height * 2
 
 
 def to_ps1_4bpp(rows, width, height):
     """Pack pixel rows into PS1 4bpp uint16_t array.
     PS1 4bpp: bits 0-3 = leftmost pixel, bits 12-15 = rightmost pixel."""
-    data = []
-    for y in range(height):
-        for x in range(0, width, 4):
-            p0 = rows[y][x] if x < len(rows[y]) else 0
-            p1 = rows[y][x + 1] if x + 1 < len(rows[y]) else 0
-            p2 = rows[y][x + 2] if x + 2 < len(rows[y]) else 0
-            p3 = rows[y][x + 3] if x + 3 < len(rows[y]) else 0
-            word = (p0 & 0xF) | ((p1 & 0xF) << 4) | ((p2 & 0xF) << 8) | ((p3 & 0xF) << 12)
-            data.append(word)
-    return data
+    pix = np.asarray(rows, dtype=np.uint16)[:height, :width] & 0xF
+    if width % 4:
+        pix = np.pad(pix, ((0, 0), (0, 4 - width % 4)))
+    q = pix.reshape(height, -1, 4)
+    words = q[..., 0] | (q[..., 1] << 4) | (q[..., 2] << 8) | (q[..., 3] << 12)
+    return words.ravel()
 
 
 def write_array(f, name, data, comment):
-    """Write a uint16_t C array to file handle."""
-    f.write(f"// {comment}\n")
-    f.write(f"static const uint16_t {name}[{len(data)}] = {{\n")
-    for i in range(0, len(data), 16):
-        chunk = data[i : i + 16]
-        f.write("    " + ", ".join(f"0x{v:04X}" for v in chunk) + ",\n")
-    f.write("};\n\n")
+    """Write a uint16_t C array (sequence or ndarray) to file handle."""
+    parts = [
+        f"// {comment}\n",
+        f"static const uint16_t {name}[{len(data)}] = {{\n",
+    ]
+    # Format all values in one NumPy call, then lay out 16 per line
+    hex_words = np.char.mod("0x%04X", np.asarray(data, dtype=np.uint16)).tolist()
+    for i in range(0, len(hex_words), 16):
+        parts.append("    " + ", ".join(hex_words[i : i + 16]) + ",\n")
+    parts.append("};\n\n")
+
+    f.write("".join(parts))
 
 
 def main():
@@ -142,8 +147,7 @@ def main():
     print(f"  Source: {gw}x{gh}")
 
     # Pad to 128x128 (bottom half empty)
-    while len(grows) < 128:
-        grows.append([0] * gw)
+    grows = np.pad(grows, ((0, 128 - gh), (0, 0)))
 
     grows_2x, gw2, gh2 = double_pixels(grows, gw, 128)
     gfx_data = to_ps1_4bpp(grows_2x, gw2, gh2)
@@ -156,10 +160,7 @@ def main():
                     f"GFX spritesheet: {gw2}x{gh2} 4bpp (doubled from {gw}x128)")
 
         # Sprite CLUT (PICO-8 palette, color 0 = transparent = 0x0000)
-        clut = []
-        for i, (r, g, b) in enumerate(PICO8_PALETTE):
-            clut.append(0x0000 if i == 0 else rgb_to_ps1(r, g, b))
-        write_array(f, "pico8_clut", clut,
+        write_array(f, "pico8_clut", PICO8_CLUT_PS1,
                     "PICO-8 palette as PS1 15-bit CLUT (color 0 = transparent)")
 
         # RGB888 palette for non-textured primitives
@@ -169,17 +170,11 @@ def main():
             f.write(f"    {{{r}, {g}, {b}}},\n")
         f.write("};\n\n")
 
-        # Text CLUTs: 16 CLUTs, one per text color
-        # Font pixels use index 7. Each CLUT maps index 7 to the desired text color.
+        # Text CLUTs
         f.write("// Text CLUTs: font index 7 -> each PICO-8 color\n")
         f.write("static const uint16_t text_cluts[16][16] = {\n")
-        for tc in range(16):
-            row = [0x0000] * 16
-            if tc != 0:
-                r, g, b = PICO8_PALETTE[tc]
-                row[7] = rgb_to_ps1(r, g, b)
-            line = ", ".join(f"0x{v:04X}" for v in row)
-            f.write(f"    {{{line}}},\n")
+        f.write("".join("    {" + ", ".join(f"0x{v:04X}" for v in row) + "},\n"
+                        for row in TEXT_CLUTS))
         f.write("};\n")
 
     # --- Font ---
@@ -188,10 +183,7 @@ def main():
     print(f"  Source: {fw}x{fh}")
 
     # Expand 1bpp to 4bpp: 0 -> index 0 (transparent), 1 -> index 7 (white)
-    for y in range(fh):
-        for x in range(fw):
-            if frows[y][x] != 0:
-                frows[y][x] = 7
+    frows = frows * 7
 
     frows_2x, fw2, fh2 = double_pixels(frows, fw, fh)
     font_data = to_ps1_4bpp(frows_2x, fw2, fh2)
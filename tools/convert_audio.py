@@ -9,36 +9,35 @@ Parses __sfx__ and __music__ sections, generates:
 Also pre-computes a pitch lookup table (PICO-8 key -> SPU sample rate register).
 """
 
-import math
 import os
 import struct
 
+import numpy as np
+
 # --- PICO-8 SFX/Music parsing ---
 
+# Hex digit -> value, to avoid an int(s, 16) parse per field
+HEX_DIGIT = {c: int(c, 16) for c in "0123456789abcdefABCDEF"}
+
+
+def _p8_section(lines, marker):
+    """Return the lines of a .p8 section, up to the next __name__ marker."""
+    try:
+        start = lines.index(marker) + 1
+    except ValueError:
+        return []
+    end = next((i for i in range(start, len(lines)) if lines[i].startswith("__")),
+               len(lines))
+    return lines[start:end]
+
+
 def parse_p8_audio(filename):
     """Parse __sfx__ and __music__ sections from a .p8 file."""
-    sfx_lines = []
-    music_lines = []
-    section = None
-
     with open(filename) as f:
-        for line in f:
-            line = line.strip()
-            if line == "__sfx__":
-                section = "sfx"
-                continue
-            elif line == "__music__":
-                section = "music"
-                continue
-            elif line.startswith("__"):
-                section = None
-                continue
-
-            if section == "sfx" and len(line) >= 168:
-                sfx_lines.append(line)
-            elif section == "music" and len(line) >= 10:
-                music_lines.append(line)
+        lines = [line.strip() for line in f.read().split("\n")]
 
+    sfx_lines = [line for line in _p8_section(lines, "__sfx__") if len(line) >= 168]
+    music_lines = [line for line in _p8_section(lines, "__music__") if len(line) >= 10]
     return sfx_lines, music_lines
 
 
@@ -55,40 +54,37 @@ def decode_sfx(sfx_lines):
         I  = instrument/waveform (0-7)
         V  = volume (0-7)
         F  = effect (0-7)
+
+    Returns a dict of parallel arrays, padded to 64 entries:
+      editor_mode, speed, loop_start, loop_end: uint8[n]
+      pitch, instrument, volume, effect:        uint8[n, 32]
     """
-    sfx_data = []
-    for line in sfx_lines:
-        editor_mode = int(line[0:2], 16)
-        speed = int(line[2:4], 16)
-        loop_start = int(line[4:6], 16)
-        loop_end = int(line[6:8], 16)
-
-        notes = []
-        for i in range(32):
-            offset = 8 + i * 5
-            s = line[offset:offset + 5]
-            pitch = int(s[0:2], 16)
-            instrument = int(s[2], 16) & 7
-            volume = int(s[3], 16) & 7
-            effect = int(s[4], 16) & 7
-            notes.append((pitch, instrument, volume, effect))
-
-        sfx_data.append({
-            "editor_mode": editor_mode,
-            "speed": speed,
-            "loop_start": loop_start,
-            "loop_end": loop_end,
-            "notes": notes,
-        })
-
-    # Pad to 64 entries
-    while len(sfx_data) < 64:
-        sfx_data.append({
-            "editor_mode": 0, "speed": 1, "loop_start": 0, "loop_end": 0,
-            "notes": [(0, 0, 0, 0)] * 32,
-        })
-
-    return sfx_data
+    n = max(len(sfx_lines), 64)
+    h = np.array([[HEX_DIGIT[c] for c in line[:168]] for line in sfx_lines],
+                 dtype=np.uint8).reshape(-1, 168)
+    header = (h[:, 0:8:2] << 4) | h[:, 1:8:2]
+    notes = h[:, 8:].reshape(-1, 32, 5)
+
+    # Padding entries: speed 1, everything else 0
+    sfx = {
+        "editor_mode": np.zeros(n, dtype=np.uint8),
+        "speed": np.ones(n, dtype=np.uint8),
+        "loop_start": np.zeros(n, dtype=np.uint8),
+        "loop_end": np.zeros(n, dtype=np.uint8),
+        "pitch": np.zeros((n, 32), dtype=np.uint8),
+        "instrument": np.zeros((n, 32), dtype=np.uint8),
+        "volume": np.zeros((n, 32), dtype=np.uint8),
+        "effect": np.zeros((n, 32), dtype=np.uint8),
+    }
+    count = len(h)
+    for i, key in enumerate(("editor_mode", "speed", "loop_start", "loop_end")):
+        sfx[key][:count] = header[:, i]
+    sfx["pitch"][:count] = (notes[..., 0] << 4) | notes[..., 1]
+    sfx["instrument"][:count] = notes[..., 2] & 7
+    sfx["volume"][:count] = notes[..., 3] & 7
+    sfx["effect"][:count] = notes[..., 4] & 7
+
+    return sfx
 
 
 def decode_music(music_lines):
@@ -99,28 +95,23 @@ def decode_music(music_lines):
       AA,BB,CC,DD = channel SFX indices (hex bytes)
         bit 6 (0x40) set = channel disabled
         bits 0-5 = SFX index
+
+    Returns a dict of parallel arrays, padded to 64 patterns:
+      flags: uint8[n], sfx: uint8[n, 4], enabled: bool[n, 4]
     """
-    patterns = []
-    for line in music_lines:
+    n = max(len(music_lines), 64)
+    flags = np.zeros(n, dtype=np.uint8)
+    channels = np.full((n, 4), 0x40, dtype=np.uint8)  # padding: disabled
+    for i, line in enumerate(music_lines):
         parts = line.split()
-        flags = int(parts[0], 16)
-        channels_hex = parts[1]
-        channels = []
-        for i in range(4):
-            val = int(channels_hex[i * 2:i * 2 + 2], 16)
-            enabled = (val & 0x40) == 0
-            sfx_idx = val & 0x3F
-            channels.append((sfx_idx, enabled))
-        patterns.append({"flags": flags, "channels": channels})
-
-    # Pad to 64
-    while len(patterns) < 64:
-        patterns.append({
-            "flags": 0,
-            "channels": [(0, False), (0, False), (0, False), (0, False)],
-        })
-
-    return patterns
+        flags[i] = int(parts[0], 16)
+        channels[i] = np.frombuffer(bytes.fromhex(parts[1][:8]), dtype=np.uint8)
+
+    return {
+        "flags": flags,
+        "sfx": channels & 0x3F,
+        "enabled": (channels & 0x40) == 0,
+    }
 
 
 # --- ADPCM encoding ---
@@ -130,6 +121,46 @@ ADPCM_K0 = [0, 60, 115, 98, 122]
 ADPCM_K1 = [0, 0, -52, -55, -60]
 
 
+def _try_filter_shift(samples, k0, k1, shift, limit=float("inf")):
+    """Run the encode/decode recurrence for one filter/shift candidate.
+
+    Returns (squared_error, nibbles). This is the hot inner loop of the
+    encoder, kept free of attribute lookups and allocations. Gives up as
+    soon as the error reaches `limit` (nibbles are then incomplete).
+    """
+    error = 0
+    old = 0
+    older = 0
+    nibbles = []
+    append = nibbles.append
+    down = 12 - shift  # shift is 0-12, so this is always a right shift
+
+    for s in samples:
+        pred = (old * k0 + older * k1 + 32) >> 6
+        residual = s - pred
+        # Quantize
+        nib = residual >> down
+        if nib < -8:
+            nib = -8
+        elif nib > 7:
+            nib = 7
+        # Decode back
+        decoded = (nib << down) + pred
+        if decoded < -32768:
+            decoded = -32768
+        elif decoded > 32767:
+            decoded = 32767
+        diff = decoded - s
+        error += diff * diff
+        if error >= limit:
+            break
+        append(nib & 0xF)
+        older = old
+        old = decoded
+
+    return error, nibbles
+
+
 def encode_adpcm_block(samples_28, flags=0):
     """Encode 28 PCM samples (int16) into one 16-byte PS1 ADPCM block.
 
@@ -137,108 +168,119 @@ def encode_adpcm_block(samples_28, flags=0):
     Returns 16 bytes.
     """
     best_error = float("inf")
-    best_block = None
+    best = None
 
     for filt in range(4):
         k0 = ADPCM_K0[filt]
         k1 = ADPCM_K1[filt]
 
         for shift in range(13):
-            error = 0
-            old = 0
-            older = 0
-            nibbles = []
-
-            for s in samples_28:
-                pred = (old * k0 + older * k1 + 32) >> 6
-                residual = s - pred
-                # Quantize
-                raw = residual >> (12 - shift) if shift <= 12 else residual << (shift - 12)
-                nib = max(-8, min(7, round(raw)))
-                # Decode back
-                decoded = (nib << (12 - shift)) + pred
-                decoded = max(-32768, min(32767, decoded))
-                error += (decoded - s) ** 2
-                nibbles.append(nib & 0xF)
-                older = old
-                old = decoded
-
+            error, nibbles = _try_filter_shift(samples_28, k0, k1, shift, best_error)
             if error < best_error:
                 best_error = error
-                # Pack nibbles
-                block = bytearray(16)
-                block[0] = (shift & 0xF) | ((filt & 0x7) << 4)
-                block[1] = flags
-                for i in range(0, 28, 2):
-                    lo = nibbles[i] & 0xF
-                    hi = nibbles[i + 1] & 0xF if i + 1 < 28 else 0
-                    block[2 + i // 2] = lo | (hi << 4)
-                best_block = bytes(block)
+                best = (filt, shift, nibbles)
 
-    return best_block
+    # Pack nibbles of the winning candidate
+    filt, shift, nibbles = best
+    block = bytearray(16)
+    block[0] = (shift & 0xF) | ((filt & 0x7) << 4)
+    block[1] = flags
+    for i in range(0, 28, 2):
+        block[2 + i // 2] = nibbles[i] | (nibbles[i + 1] << 4)
+    return bytes(block)
 
 
 # --- Waveform generation ---
 
+# Organ harmonic sum per cycle length, the only waveform needing sin()
+_ORGAN_CACHE = {}
+
+
+def _organ_cycle(n):
+    """Return one cycle of the organ waveform (-1..1) over n samples."""
+    v = _ORGAN_CACHE.get(n)
+    if v is None:
+        t = np.arange(n, dtype=np.float64) / n
+        v = (np.sin(2 * np.pi * t)
+             + 0.5 * np.sin(4 * np.pi * t)
+             + 0.25 * np.sin(8 * np.pi * t)) / 1.75
+        v.flags.writeable = False
+        _ORGAN_CACHE[n] = v
+    return v
+
+
 def gen_waveform_samples(waveform_id, num_samples=28):
     """Generate one cycle of a PICO-8 waveform as int16 PCM samples."""
     amp = 24000  # Leave headroom below int16 max
 
     # Noise: use iterative LCG (not the per-sample t-based approach)
     if waveform_id == 6:
-        samples = []
+        seeds = []
         seed = 12345
         for _ in range(num_samples):
             seed = (seed * 1103515245 + 12345) & 0xFFFFFFFF
-            v = ((seed >> 16) & 0xFFFF) / 32768.0 - 1.0
-            samples.append(int(max(-32768, min(32767, v * amp))))
-        return samples
-
-    samples = []
-    n = num_samples
-    for i in range(n):
-        t = i / n  # 0.0 to 1.0
-
-        if waveform_id == 0:  # Triangle
-            if t < 0.5:
-                v = t * 2.0
-            else:
-                v = 2.0 - t * 2.0
-            v = v * 2.0 - 1.0
+            seeds.append(seed)
+        v = ((np.array(seeds, dtype=np.uint32) >> 16) & 0xFFFF) / 32768.0 - 1.0
+        return np.clip(v * amp, -32768, 32767).astype(np.int16).tolist()
 
-        elif waveform_id == 1:  # Tilted saw (steeper rise)
-            if t < 0.875:
-                v = t / 0.875
-            else:
-                v = 1.0 - (t - 0.875) / 0.125
-            v = v * 2.0 - 1.0
+    t = np.arange(num_samples, dtype=np.float64) / num_samples  # 0.0 to 1.0
+
+    if waveform_id == 0:  # Triangle
+        v = np.where(t < 0.5, t * 2.0, 2.0 - t * 2.0) * 2.0 - 1.0
+
+    elif waveform_id == 1:  # Tilted saw (steeper rise)
+        v = np.where(t < 0.875, t / 0.875, 1.0 - (t - 0.875) / 0.125) * 2.0 - 1.0
 
-        elif waveform_id == 2:  # Saw
-            v = t * 2.0 - 1.0
+    elif waveform_id == 2:  # Saw
+        v = t * 2.0 - 1.0
 
-        elif waveform_id == 3:  # Square (50% duty)
-            v = 1.0 if t < 0.5 else -1.0
+    elif waveform_id == 3:  # Square (50% duty)
+        v = np.where(t < 0.5, 1.0, -1.0)
 
-        elif waveform_id == 4:  # Pulse (25% duty)
-            v = 1.0 if t < 0.25 else -1.0
+    elif waveform_id == 4:  # Pulse (25% duty)
+        v = np.where(t < 0.25, 1.0, -1.0)
 
-        elif waveform_id == 5:  # Organ (triangle + harmonics)
-            v = (math.sin(2 * math.pi * t)
-                 + 0.5 * math.sin(4 * math.pi * t)
-                 + 0.25 * math.sin(8 * math.pi * t)) / 1.75
+    elif waveform_id == 5:  # Organ (triangle + harmonics)
+        v = _organ_cycle(num_samples)
 
-        elif waveform_id == 7:  # Phaser (detuned square waves)
-            sq1 = 1.0 if t < 0.5 else -1.0
-            t2 = (t + 0.25) % 1.0
-            sq2 = 1.0 if t2 < 0.5 else -1.0
-            v = (sq1 + sq2 * 0.5) / 1.5
+    elif waveform_id == 7:  # Phaser (detuned square waves)
+        sq1 = np.where(t < 0.5, 1.0, -1.0)
+        sq2 = np.where((t + 0.25) % 1.0 < 0.5, 1.0, -1.0)
+        v = (sq1 + sq2 * 0.5) / 1.5
 
-        else:
-            v = 0.0
+    else:
+        v = np.zeros_like(t)
 
-        samples.append(int(max(-32768, min(32767, v * amp))))
+    # Truncate toward zero, as int() does
+    return np.clip(v * amp, -32768, 32767).astype(np.int16).tolist()
 
-    return samples
+
+def encode_waveform(w):
+    """Encode one waveform's ADPCM loop. Returns bytes.
+
+    Each waveform is independent of the others, so this is the unit of
+    work for gen_all_waveforms.
+    """
+    if w == 6:
+        # Noise: 8 blocks = 224 samples for less tonal looping
+        noise_samples = gen_waveform_samples(6, 224)
+        blks = bytearray()
+        for b in range(8):
+            chunk = noise_samples[b * 28:(b + 1) * 28]
+            if b == 0:
+                flags = 0x04  # loop start
+            elif b == 7:
+                flags = 0x03  # loop end + repeat
+            else:
+                flags = 0x00
+            blks += encode_adpcm_block(chunk, flags=flags)
+        return bytes(blks)
+
+    # 2 blocks per waveform (56 samples = ~2 cycles at 28 samples/cycle)
+    samples = gen_waveform_samples(w, 56)
+    blk0 = encode_adpcm_block(samples[0:28], flags=0x04)   # loop start
+    blk1 = encode_adpcm_block(samples[28:56], flags=0x03)  # loop end + repeat
+    return blk0 + blk1
 
 
 def gen_all_waveforms():
@@ -249,32 +291,11 @@ def gen_all_waveforms():
       Block 1: loop_end + repeat flags (0x03), more waveform / padding
 
     For noise, use 8 blocks (224 samples) for a less tonal loop.
-    """
-    all_data = bytearray()
 
-    for w in range(8):
-        if w == 6:
-            # Noise: 8 blocks = 224 samples for less tonal looping
-            noise_samples = gen_waveform_samples(6, 224)
-            blks = bytearray()
-            for b in range(8):
-                chunk = noise_samples[b * 28:(b + 1) * 28]
-                if b == 0:
-                    flags = 0x04  # loop start
-                elif b == 7:
-                    flags = 0x03  # loop end + repeat
-                else:
-                    flags = 0x00
-                blks += encode_adpcm_block(chunk, flags=flags)
-            all_data += blks
-        else:
-            # 2 blocks per waveform (56 samples = ~2 cycles at 28 samples/cycle)
-            samples = gen_waveform_samples(w, 56)
-            blk0 = encode_adpcm_block(samples[0:28], flags=0x04)   # loop start
-            blk1 = encode_adpcm_block(samples[28:56], flags=0x03)  # loop end + repeat
-            all_data += blk0 + blk1
-
-    return all_data
+    Encoding runs serially: the whole set takes a few milliseconds, less
+    than starting a process pool would.
+    """
+    return bytearray().join(map(encode_waveform, range(8)))
 
 
 # --- Pitch table ---
@@ -287,57 +308,59 @@ def gen_pitch_table(samples_per_cycle=56):
 
     For noise waveform (224 samples/cycle), caller should quarter the pitch value.
     """
-    table = []
-    for key in range(64):
-        freq = 440.0 * (2.0 ** ((key - 33) / 12.0))
-        rate = int((freq * samples_per_cycle / 44100.0) * 0x1000 + 0.5)
-        rate = max(0, min(0x3FFF, rate))
-        table.append(rate)
-    return table
+    key = np.arange(64)
+    freq = 440.0 * (2.0 ** ((key - 33) / 12.0))
+    rate = np.floor((freq * samples_per_cycle / 44100.0) * 0x1000 + 0.5)
+    return np.clip(rate, 0, 0x3FFF).astype(np.uint16).tolist()
 
 
 # --- Output ---
 
-def write_sfx_header(f, sfx_data):
+def write_sfx_header(f, sfx):
     """Write sfx_data.h content."""
-    f.write("#pragma once\n#include <stdint.h>\n\n")
+    parts = []
+    parts.append("#pragma once\n#include <stdint.h>\n\n")
 
     # SFX note: pack pitch(6) + instrument(3) + volume(3) + effect(3) = 15 bits into uint16_t
-    f.write("// Packed SFX note: bits [5:0]=pitch, [8:6]=instrument, [11:9]=volume, [14:12]=effect\n")
-    f.write("// Access macros:\n")
-    f.write("#define SFX_PITCH(n)  ((n) & 0x3F)\n")
-    f.write("#define SFX_INSTR(n)  (((n) >> 6) & 0x7)\n")
-    f.write("#define SFX_VOL(n)    (((n) >> 9) & 0x7)\n")
-    f.write("#define SFX_EFFECT(n) (((n) >> 12) & 0x7)\n\n")
-
-    f.write("struct P8SfxMeta {\n")
-    f.write("    uint8_t speed;\n")
-    f.write("    uint8_t loop_start;\n")
-    f.write("    uint8_t loop_end;\n")
-    f.write("    uint8_t pad;\n")
-    f.write("};\n\n")
+    parts.append("// Packed SFX note: bits [5:0]=pitch, [8:6]=instrument, [11:9]=volume, [14:12]=effect\n")
+    parts.append("// Access macros:\n")
+    parts.append("#define SFX_PITCH(n)  ((n) & 0x3F)\n")
+    parts.append("#define SFX_INSTR(n)  (((n) >> 6) & 0x7)\n")
+    parts.append("#define SFX_VOL(n)    (((n) >> 9) & 0x7)\n")
+    parts.append("#define SFX_EFFECT(n) (((n) >> 12) & 0x7)\n\n")
+
+    parts.append("struct P8SfxMeta {\n")
+    parts.append("    uint8_t speed;\n")
+    parts.append("    uint8_t loop_start;\n")
+    parts.append("    uint8_t loop_end;\n")
+    parts.append("    uint8_t pad;\n")
+    parts.append("};\n\n")
 
     # SFX metadata
-    f.write("static const P8SfxMeta sfx_meta[64] = {\n")
-    for s in sfx_data:
-        f.write(f"    {{{s['speed']}, {s['loop_start']}, {s['loop_end']}, 0}},\n")
-    f.write("};\n\n")
+    parts.append("static const P8SfxMeta sfx_meta[64] = {\n")
+    for speed, loop_start, loop_end in zip(sfx["speed"].tolist(),
+                                           sfx["loop_start"].tolist(),
+                                           sfx["loop_end"].tolist()):
+        parts.append(f"    {{{speed}, {loop_start}, {loop_end}, 0}},\n")
+    parts.append("};\n\n")
 
     # SFX note data: 64 SFX x 32 notes
-    f.write("static const uint16_t sfx_notes[64][32] = {\n")
-    for si, s in enumerate(sfx_data):
-        f.write(f"    {{ // SFX {si}\n        ")
-        vals = []
-        for pitch, instr, vol, effect in s["notes"]:
-            packed = (pitch & 0x3F) | ((instr & 7) << 6) | ((vol & 7) << 9) | ((effect & 7) << 12)
-            vals.append(f"0x{packed:04X}")
-        f.write(", ".join(vals[:16]) + ",\n        ")
-        f.write(", ".join(vals[16:]) + "\n")
-        f.write("    },\n")
-    f.write("};\n\n")
-
-
-def write_music_header(f, patterns):
+    packed = ((sfx["pitch"].astype(np.uint16) & 0x3F)
+              | ((sfx["instrument"].astype(np.uint16) & 7) << 6)
+              | ((sfx["volume"].astype(np.uint16) & 7) << 9)
+              | ((sfx["effect"].astype(np.uint16) & 7) << 12))
+    parts.append("static const uint16_t sfx_notes[64][32] = {\n")
+    for si, vals in enumerate(np.char.mod("0x%04X", packed).tolist()):
+        parts.append(f"    {{ // SFX {si}\n        ")
+        parts.append(", ".join(vals[:16]) + ",\n        ")
+        parts.append(", ".join(vals[16:]) + "\n")
+        parts.append("    },\n")
+    parts.append("};\n\n")
+
+    f.write("".join(parts))
+
+
+def write_music_header(f, music):
     """Write music_data.h content."""
     f.write("#pragma once\n#include <stdint.h>\n\n")
 
@@ -353,43 +376,32 @@ def write_music_header(f, patterns):
     f.write("};\n\n")
 
     f.write("static const P8MusicPattern music_patterns[64] = {\n")
-    for i, p in enumerate(patterns):
-        chans = []
-        for sfx_idx, enabled in p["channels"]:
-            val = sfx_idx if enabled else (sfx_idx | 0x80)
-            chans.append(f"0x{val:02X}")
-        ch_str = ", ".join(chans)
-        f.write(f"    {{0x{p['flags']:02X}, {{{ch_str}}}, {{0,0,0}}}},\n")
+    chans = np.where(music["enabled"], music["sfx"], music["sfx"] | 0x80)
+    for flags, row in zip(music["flags"].tolist(), np.char.mod("0x%02X", chans).tolist()):
+        ch_str = ", ".join(row)
+        f.write(f"    {{0x{flags:02X}, {{{ch_str}}}, {{0,0,0}}}},\n")
     f.write("};\n\n")
 
-    # Count valid patterns (non-empty)
-    num_valid = 0
-    for p in patterns:
-        has_active = any(en for _, en in p["channels"])
-        if has_active or p["flags"]:
-            num_valid = patterns.index(p) + 1
-    # Find the last non-empty pattern
-    for i in range(len(patterns) - 1, -1, -1):
-        has_active = any(en for _, en in patterns[i]["channels"])
-        if has_active or patterns[i]["flags"]:
-            num_valid = i + 1
-            break
+    # Count valid patterns: up to and including the last non-empty one
+    active = np.flatnonzero(music["enabled"].any(axis=1) | (music["flags"] != 0))
+    num_valid = int(active[-1]) + 1 if active.size else 0
     f.write(f"#define MUSIC_PATTERN_COUNT {num_valid}\n")
 
 
 def write_waveform_header(f, adpcm_data, pitch_table):
     """Write waveform_data.h content."""
-    f.write("#pragma once\n#include <stdint.h>\n\n")
+    parts = []
+    parts.append("#pragma once\n#include <stdint.h>\n\n")
 
     # Waveform ADPCM data
-    f.write(f"// 8 ADPCM waveform loops ({len(adpcm_data)} bytes total)\n")
-    f.write("// Waveforms 0-5,7: 2 blocks (32 bytes each)\n")
-    f.write("// Waveform 6 (noise): 8 blocks (128 bytes)\n")
-    f.write(f"static const uint8_t waveform_adpcm[{len(adpcm_data)}] __attribute__((aligned(4))) = {{\n")
-    for i in range(0, len(adpcm_data), 16):
-        chunk = adpcm_data[i:i + 16]
-        f.write("    " + ", ".join(f"0x{b:02X}" for b in chunk) + ",\n")
-    f.write("};\n\n")
+    parts.append(f"// 8 ADPCM waveform loops ({len(adpcm_data)} bytes total)\n")
+    parts.append("// Waveforms 0-5,7: 2 blocks (32 bytes each)\n")
+    parts.append("// Waveform 6 (noise): 8 blocks (128 bytes)\n")
+    parts.append(f"static const uint8_t waveform_adpcm[{len(adpcm_data)}] __attribute__((aligned(4))) = {{\n")
+    hex_bytes = np.char.mod("0x%02X", np.frombuffer(bytes(adpcm_data), dtype=np.uint8)).tolist()
+    for i in range(0, len(hex_bytes), 16):
+        parts.append("    " + ", ".join(hex_bytes[i:i + 16]) + ",\n")
+    parts.append("};\n\n")
 
     # Byte offsets for each waveform in the ADPCM data
     offsets = []
@@ -397,31 +409,33 @@ def write_waveform_header(f, adpcm_data, pitch_table):
     for w in range(8):
         offsets.append(pos)
         pos += 128 if w == 6 else 32  # noise is 8 blocks, others 2
-    f.write("// Byte offset of each waveform in waveform_adpcm[]\n")
-    f.write("static const uint16_t waveform_offset[8] = {\n    ")
-    f.write(", ".join(str(o) for o in offsets))
-    f.write("\n};\n\n")
+    parts.append("// Byte offset of each waveform in waveform_adpcm[]\n")
+    parts.append("static const uint16_t waveform_offset[8] = {\n    ")
+    parts.append(", ".join(str(o) for o in offsets))
+    parts.append("\n};\n\n")
 
     # Byte size of each waveform
     sizes = [128 if w == 6 else 32 for w in range(8)]
-    f.write("static const uint16_t waveform_size[8] = {\n    ")
-    f.write(", ".join(str(s) for s in sizes))
-    f.write("\n};\n\n")
+    parts.append("static const uint16_t waveform_size[8] = {\n    ")
+    parts.append(", ".join(str(s) for s in sizes))
+    parts.append("\n};\n\n")
 
     # Pitch lookup table
-    f.write("// SPU sample rate register values for PICO-8 keys 0-63\n")
-    f.write("// Based on 56 samples/cycle (for noise, quarter the value)\n")
-    f.write("static const uint16_t spu_pitch_table[64] = {\n    ")
+    parts.append("// SPU sample rate register values for PICO-8 keys 0-63\n")
+    parts.append("// Based on 56 samples/cycle (for noise, quarter the value)\n")
+    parts.append("static const uint16_t spu_pitch_table[64] = {\n    ")
     for i in range(0, 64, 8):
         chunk = pitch_table[i:i + 8]
-        f.write(", ".join(f"0x{v:04X}" for v in chunk))
+        parts.append(", ".join(f"0x{v:04X}" for v in chunk))
         if i + 8 < 64:
-            f.write(",\n    ")
-    f.write("\n};\n\n")
+            parts.append(",\n    ")
+    parts.append("\n};\n\n")
 
     # SPU RAM base address for waveform uploads
-    f.write("// SPU RAM address for waveform data upload (in bytes)\n")
-    f.write("#define SPU_WAVEFORM_BASE 0x1000\n")
+    parts.append("// SPU RAM address for waveform data upload (in bytes)\n")
+    parts.append("#define SPU_WAVEFORM_BASE 0x1000\n")
+
+    f.write("".join(parts))
 
 
 def main():